@@ -1,5 +1,6 @@
-import sklearn
 import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, matthews_corrcoef, \
+    mean_squared_error, r2_score, explained_variance_score
 
 
 def get_evaluation_report(y_pred: np.array, y_true: np.array, task: str, prefix: str = '') -> dict:
@@ -13,25 +14,32 @@ def get_evaluation_report(y_pred: np.array, y_true: np.array, task: str, prefix:
 
     :return: dictionary with common metrics
     """
-    if len(y_pred) == (len(y_true)-1):
-        print('y_pred has one element less than y_true (e.g. due to batch size config) -> dropped last element')
-        y_true = y_true[:-1]
+    if len(y_pred) < len(y_true):
+        # rare case, e.g. y_pred has one element less than y_true due to the batch size config
+        print('y_pred has less elements than y_true (e.g. due to batch size config) -> dropped last elements')
+        y_true = y_true[:len(y_pred)]
     if task == 'classification':
-        average = 'micro' if len(np.unique(y_true)) > 2 else 'binary'
+        accuracy = accuracy_score(y_true=y_true, y_pred=y_pred)
+        if len(np.unique(y_true)) > 2:
+            # micro-averaged f1 score, precision and recall are equal to the accuracy for single-label multiclass
+            f1, precision, recall = accuracy, accuracy, accuracy
+        else:
+            f1 = f1_score(y_true=y_true, y_pred=y_pred, average='binary')
+            precision = precision_score(y_true=y_true, y_pred=y_pred, zero_division=0, average='binary')
+            recall = recall_score(y_true=y_true, y_pred=y_pred, zero_division=0, average='binary')
         eval_report_dict = {
-            prefix + 'accuracy': sklearn.metrics.accuracy_score(y_true=y_true, y_pred=y_pred),
-            prefix + 'f1_score': sklearn.metrics.f1_score(y_true=y_true, y_pred=y_pred, average=average),
-            prefix + 'precision': sklearn.metrics.precision_score(y_true=y_true, y_pred=y_pred,
-                                                                  zero_division=0, average=average),
-            prefix + 'recall': sklearn.metrics.recall_score(y_true=y_true, y_pred=y_pred,
-                                                            zero_division=0, average=average),
-            prefix + 'mcc': sklearn.metrics.matthews_corrcoef(y_true=y_true, y_pred=y_pred)
+            prefix + 'accuracy': accuracy,
+            prefix + 'f1_score': f1,
+            prefix + 'precision': precision,
+            prefix + 'recall': recall,
+            prefix + 'mcc': matthews_corrcoef(y_true=y_true, y_pred=y_pred)
         }
     else:
+        mse = mean_squared_error(y_true=y_true, y_pred=y_pred)
         eval_report_dict = {
-            prefix + 'mse': sklearn.metrics.mean_squared_error(y_true=y_true, y_pred=y_pred),
-            prefix + 'rmse': sklearn.metrics.mean_squared_error(y_true=y_true, y_pred=y_pred, squared=False),
-            prefix + 'r2_score': sklearn.metrics.r2_score(y_true=y_true, y_pred=y_pred),
-            prefix + 'explained_variance': sklearn.metrics.explained_variance_score(y_true=y_true, y_pred=y_pred)
+            prefix + 'mse': mse,
+            prefix + 'rmse': np.sqrt(mse),
+            prefix + 'r2_score': r2_score(y_true=y_true, y_pred=y_pred),
+            prefix + 'explained_variance': explained_variance_score(y_true=y_true, y_pred=y_pred)
         }
     return eval_report_dict
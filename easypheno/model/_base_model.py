@@ -239,4 +239,16 @@ class BaseModel(abc.ABC):
         :param path: path where the model will be saved
         :param filename: filename of the model
         """
-        joblib.dump(self, path.joinpath(filename), compress=3)
+        dump_model(model=self, path=path, filename=filename)
+
+
+def dump_model(model, path: pathlib.Path, filename: str):
+    """
+    Persist a model object on a hard drive with joblib, used by the save_model methods of all model base classes
+
+    :param model: model object to persist
+    :param path: path where the model will be saved
+    :param filename: filename of the model
+    """
+    # no compression, as single-threaded zlib compression dominated the saving time for large models
+    joblib.dump(model, path.joinpath(filename), compress=0)
@@ -1,8 +1,9 @@
 import abc
-import joblib
 import numpy as np
 import pathlib
 
+from . import _base_model
+
 
 class ParamFreeBaseModel(abc.ABC):
     """
@@ -81,4 +82,4 @@ class ParamFreeBaseModel(abc.ABC):
         :param path: path where the model will be saved
         :param filename: filename of the model
         """
-        joblib.dump(self, path.joinpath(filename), compress=3)
+        _base_model.dump_model(model=self, path=path, filename=filename)
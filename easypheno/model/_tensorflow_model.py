@@ -2,7 +2,6 @@ import abc
 import numpy as np
 import optuna
 import tensorflow as tf
-import joblib
 import pathlib
 
 from . import _base_model
@@ -173,5 +172,5 @@ class TensorflowModel(_base_model.BaseModel, abc.ABC):
         optimizer = self.optimizer
         # special case for serialization of optimizer prior to saving
         self.optimizer = tf.keras.optimizers.serialize(self.optimizer)
-        joblib.dump(self, path.joinpath(filename), compress=3)
+        super().save_model(path=path, filename=filename)
         self.optimizer = optimizer
@@ -98,7 +98,7 @@ class TorchModel(_base_model.BaseModel, abc.ABC):
         """
         self.model.train()
         for inputs, targets in train_loader:
-            inputs, targets = inputs.to(device=self.device), targets.to(device=self.device)
+            inputs, targets = self.inputs_to_device(inputs=inputs), targets.to(device=self.device)
             self.optimizer.zero_grad()
             outputs = self.model(inputs)
             loss = self.get_loss(outputs=outputs, targets=targets)
@@ -121,7 +121,7 @@ class TorchModel(_base_model.BaseModel, abc.ABC):
         total_loss = 0
         with torch.no_grad():
             for inputs, targets in val_loader:
-                inputs, targets = inputs.to(device=self.device), targets.to(device=self.device)
+                inputs, targets = self.inputs_to_device(inputs=inputs), targets.to(device=self.device)
                 outputs = self.model(inputs)
                 total_loss += self.get_loss(outputs=outputs, targets=targets).item()
         return total_loss / len(val_loader.dataset)
@@ -148,7 +148,7 @@ class TorchModel(_base_model.BaseModel, abc.ABC):
         predictions = None
         with torch.no_grad():
             for inputs in dataloader:
-                inputs = inputs.to(device=self.device)
+                inputs = self.inputs_to_device(inputs=inputs)
                 outputs = self.model(inputs)
                 predictions = torch.clone(outputs) if predictions is None else torch.cat((predictions, outputs))
         if self.task == 'classification':
@@ -168,6 +168,18 @@ class TorchModel(_base_model.BaseModel, abc.ABC):
             targets = targets.long()
         return self.loss_fn(outputs, targets)
 
+    def inputs_to_device(self, inputs: torch.Tensor) -> torch.Tensor:
+        """
+        Move a batch of inputs to the device, onehot encoded inputs are additionally converted from uint8 to float
+
+        :param inputs: batch of inputs
+
+        :return: inputs on the device
+        """
+        if self.encoding == 'onehot':
+            return inputs.to(device=self.device, dtype=torch.float)
+        return inputs.to(device=self.device)
+
     def get_dataloader(self, X: np.array, y: np.array = None, shuffle: bool = True) -> torch.utils.data.DataLoader:
         """
         Get a Pytorch DataLoader using the specified data and batch size
@@ -182,7 +194,8 @@ class TorchModel(_base_model.BaseModel, abc.ABC):
         if (len(X) % self.batch_size) == 1:
             X = X[:-1]
             y = y[:-1] if y is not None else None
-        X = torch.from_numpy(X).float()
+        # onehot encoding is kept as uint8 to save memory and converted to float batch-wise in inputs_to_device
+        X = torch.from_numpy(X) if self.encoding == 'onehot' else torch.from_numpy(X).float()
         if self.encoding == 'onehot':
             # Adapt to PyTorch ordering (BATCH_SIZE, CHANNELS, SIGNAL)
             X = torch.swapaxes(X, 1, 2)
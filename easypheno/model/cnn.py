@@ -1,4 +1,5 @@
 import torch
+import copy
 
 from . import _torch_model
 
@@ -38,7 +39,7 @@ class Cnn(_torch_model.TorchModel):
         for layer in range(n_layers):
             model.append(torch.nn.Conv1d(in_channels=in_channels, out_channels=out_channels,
                                          kernel_size=kernel_size, stride=stride))
-            model.append(act_function)
+            model.append(copy.deepcopy(act_function))
             model.append(torch.nn.BatchNorm1d(num_features=out_channels))
             model.append(torch.nn.Dropout(p))
             in_channels = out_channels
@@ -49,7 +50,7 @@ class Cnn(_torch_model.TorchModel):
         in_features = torch.nn.Sequential(*model)(torch.zeros(size=(1, self.width_onehot, self.n_features))).shape[1]
         out_features = int(in_features * self.suggest_hyperparam_to_optuna('n_units_factor_linear_layer'))
         model.append(torch.nn.Linear(in_features=in_features, out_features=out_features))
-        model.append(act_function)
+        model.append(copy.deepcopy(act_function))
         model.append(torch.nn.BatchNorm1d(num_features=out_features))
         model.append(torch.nn.Dropout(p))
         model.append(torch.nn.Linear(in_features=out_features, out_features=self.n_outputs))
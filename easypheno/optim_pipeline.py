@@ -16,7 +16,7 @@ def run(data_dir: str, genotype_matrix: str, phenotype_matrix: str, phenotype: s
         datasplit: str = 'nested-cv', n_outerfolds: int = 5, n_innerfolds: int = 5,
         test_set_size_percentage: int = 20, val_set_size_percentage: int = 20,
         models: list = None, n_trials: int = 100, save_final_model: bool = False,
-        batch_size: int = 32, n_epochs: int = 100000, outerfold_number_to_run: int = None):
+        batch_size: int = 32, n_epochs: int = 100000, outerfold_number_to_run: int = None, n_jobs: int = 1):
     """
     Run the whole optimization pipeline
 
@@ -38,6 +38,7 @@ def run(data_dir: str, genotype_matrix: str, phenotype_matrix: str, phenotype: s
     :param batch_size: batch size for neural network models
     :param n_epochs: number of epochs for neural network models
     :param outerfold_number_to_run: outerfold to run in case you do not want to run all
+    :param n_jobs: number of outerfolds to fit in parallel for parameter-free models, -1 uses all CPUs
     """
     warnings.simplefilter(action='ignore', category=FutureWarning)
     warnings.simplefilter(action='ignore', category=ExperimentalWarning)
@@ -107,7 +108,8 @@ def run(data_dir: str, genotype_matrix: str, phenotype_matrix: str, phenotype: s
                 phenotype=phenotype, n_outerfolds=n_outerfolds, n_innerfolds=n_innerfolds,
                 val_set_size_percentage=val_set_size_percentage, test_set_size_percentage=test_set_size_percentage,
                 maf_percentage=maf_percentage, save_final_model=save_final_model,
-                task=task, models_start_time=models_start_time, current_model_name=current_model_name, dataset=dataset
+                task=task, models_start_time=models_start_time, current_model_name=current_model_name, dataset=dataset,
+                n_jobs=n_jobs
             )
             overall_results = optim_run.run_fitting()
             print('### Finished Model Fitting for ' + current_model_name + ' ###')
@@ -6,7 +6,6 @@ import sklearn.inspection
 import numpy as np
 import shutil
 import time
-import csv
 import gc
 import pathlib
 
@@ -28,9 +27,11 @@ class OptunaOptim:
         - task (*str*): ML task (regression or classification) depending on target variable
         - current_model_name (*str*): name of the current model according to naming of .py file in package model
         - dataset (:obj:`~easypheno.preprocess.base_dataset.Dataset`): dataset to use for optimization run
+        - n_outputs (*int*): number of outputs of the prediction model
         - datasplit_subpath (*str*): subpath with datasplit info relevant for saving / naming
         - base_path (*str*): base_path for save_path
         - save_path (*str*): path for model and results storing
+        - runtime_csv (:obj:`~easypheno.utils.helper_functions.RuntimeCsvWriter`): writer for the runtime csv file
         - study (*optuna.study.Study*): optuna study for optimization run
         - current_best_val_result (*float*): the best validation result so far
         - early_stopping_point (*int*): point at which early stopping occured (relevant for some models)
@@ -65,6 +66,8 @@ class OptunaOptim:
         self.current_model_name = current_model_name
         self.task = task
         self.dataset = dataset
+        # number of classes does not change between trials and folds
+        self.n_outputs = len(np.unique(self.dataset.y_full)) if self.task == 'classification' else 1
         if self.dataset.datasplit == 'train-val-test':
             datasplit_params = [val_set_size_percentage, test_set_size_percentage]
         elif self.dataset.datasplit == 'cv-test':
@@ -74,11 +77,13 @@ class OptunaOptim:
         self.datasplit_subpath = helper_functions.get_subpath_for_datasplit(
             datasplit=self.dataset.datasplit, datasplit_params=datasplit_params
         )
-        self.base_path = save_dir.joinpath('results', genotype_matrix_name.split('.')[0], \
-                         phenotype_matrix_name.split('.')[0], phenotype, self.dataset.datasplit + '_' + \
-                         self.datasplit_subpath + '_MAF' + str(maf_percentage) + '_' + models_start_time, \
-                         current_model_name)
+        self.base_path = save_dir.joinpath(
+            'results', pathlib.Path(genotype_matrix_name).stem, pathlib.Path(phenotype_matrix_name).stem, phenotype,
+            f'{self.dataset.datasplit}_{self.datasplit_subpath}_MAF{maf_percentage}_{models_start_time}',
+            current_model_name
+        )
         self.save_path = self.base_path
+        self.runtime_csv = helper_functions.RuntimeCsvWriter()
         self.study = None
         self.current_best_val_result = None
         self.early_stopping_point = None
@@ -97,8 +102,8 @@ class OptunaOptim:
         outerfold_prefix = \
             'OUTER' + self.save_path.parts[-2].split('_')[1] + '-' if 'outerfold' in self.save_path.parts[-2] else ''
         study_name = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + '_' + outerfold_prefix + \
-                     self.user_input_params["genotype_matrix_name"].split('.')[0] + '-' + \
-                     self.user_input_params["phenotype_matrix_name"].split('.')[0] + '-' + \
+                     pathlib.Path(self.user_input_params["genotype_matrix_name"]).stem + '-' + \
+                     pathlib.Path(self.user_input_params["phenotype_matrix_name"]).stem + '-' + \
                      self.user_input_params["phenotype"] + '-MAF' + str(self.user_input_params["maf_percentage"]) + \
                      '-SPLIT' + self.dataset.datasplit + self.datasplit_subpath + \
                      '-MODEL' + self.current_model_name + '-TRIALS' + str(self.user_input_params["n_trials"])
@@ -150,7 +155,7 @@ class OptunaOptim:
         try:
             model: _base_model.BaseModel = helper_functions.get_mapping_name_to_class()[self.current_model_name](
                 task=self.task, optuna_trial=trial,
-                n_outputs=len(np.unique(self.dataset.y_full)) if self.task == 'classification' else 1,
+                n_outputs=self.n_outputs,
                 **additional_attributes_dict
             )
         except Exception as exc:
@@ -287,12 +292,9 @@ class OptunaOptim:
 
         :param dict_runtime: dictionary with runtime information
         """
-        with open(self.save_path.joinpath(self.current_model_name + '_runtime_overview.csv'), 'a') as runtime_file:
-            headers = ['Trial', 'process_time_s', 'real_time_s', 'params', 'note']
-            writer = csv.DictWriter(f=runtime_file, fieldnames=headers)
-            if runtime_file.tell() == 0:
-                writer.writeheader()
-            writer.writerow(dict_runtime)
+        self.runtime_csv.write_row(
+            file_path=self.save_path.joinpath(self.current_model_name + '_runtime_overview.csv'), row=dict_runtime
+        )
 
     def calc_runtime_stats(self) -> dict:
         """
@@ -526,4 +528,5 @@ class OptunaOptim:
 
             overall_results[key] = {'best_params': best_params, 'eval_metrics': eval_scores,
                                     'runtime_metrics': runtime_metrics}
+        self.runtime_csv.close()
         return overall_results
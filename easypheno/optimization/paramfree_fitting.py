@@ -1,9 +1,7 @@
 import pandas as pd
 import numpy as np
-import os
-import re
+import joblib
 import time
-import csv
 import pathlib
 
 from ..preprocess import base_dataset
@@ -22,8 +20,7 @@ class ParamFreeFitting:
         - current_model_name (*str*): name of the current model according to naming of .py file in package model
         - dataset (:obj:`~easypheno.preprocess.base_dataset.Dataset`): dataset to use for optimization run
         - datasplit_subpath (*str*): subpath with datasplit info relevant for saving / naming
-        - base_path (*str*): base_path for save_path
-        - save_path (*str*): path for model and results storing
+        - base_path (*str*): base path for model and results storing, outerfold subdirectories are added for nested-cv
         - user_input_params (*dict*): all params handed over to the constructor that are needed in the whole class
 
     :param save_dir: directory for saving the results.
@@ -40,12 +37,13 @@ class ParamFreeFitting:
     :param current_model_name: name of the current model according to naming of .py file in package model
     :param dataset: dataset to use for optimization run
     :param models_start_time: optimized models and starting time of the optimization run for saving purposes
+    :param n_jobs: number of outerfolds to fit in parallel, -1 uses all CPUs
     """
 
     def __init__(self, save_dir: pathlib.Path, genotype_matrix_name: str, phenotype_matrix_name: str, phenotype: str,
                  n_outerfolds: int, n_innerfolds: int, val_set_size_percentage: int, test_set_size_percentage: int,
                  maf_percentage: int, save_final_model: bool, task: str, current_model_name: str,
-                 dataset: base_dataset.Dataset, models_start_time: str):
+                 dataset: base_dataset.Dataset, models_start_time: str, n_jobs: int = 1):
         self.current_model_name = current_model_name
         self.task = task
         self.dataset = dataset
@@ -58,11 +56,11 @@ class ParamFreeFitting:
         self.datasplit_subpath = helper_functions.get_subpath_for_datasplit(
             datasplit=self.dataset.datasplit, datasplit_params=datasplit_params
         )
-        self.base_path = save_dir.joinpath('results', genotype_matrix_name.split('.')[0],
-                         phenotype_matrix_name.split('.')[0], phenotype, self.dataset.datasplit + '_' + \
-                         self.datasplit_subpath + '_MAF' + str(maf_percentage) + '_' + models_start_time,
-                                           current_model_name)
-        self.save_path = self.base_path
+        self.base_path = save_dir.joinpath(
+            'results', pathlib.Path(genotype_matrix_name).stem, pathlib.Path(phenotype_matrix_name).stem, phenotype,
+            f'{self.dataset.datasplit}_{self.datasplit_subpath}_MAF{maf_percentage}_{models_start_time}',
+            current_model_name
+        )
         self.user_input_params = locals()  # distribute all handed over params in whole class
 
     def run_fitting(self):
@@ -74,93 +72,116 @@ class ParamFreeFitting:
         # Iterate over outerfolds
         # (according to structure described in base_dataset.Dataset, only for nested-cv multiple outerfolds exist)
         helper_functions.set_all_seeds()
-        overall_results = {}
-        for outerfold_name, outerfold_info in self.dataset.datasplit_indices.items():
-            if self.dataset.datasplit == 'nested-cv':
-                # Only print outerfold info for nested-cv as it does not apply for the other splits
-                print("## Starting Fitting for " + outerfold_name + " ##")
-                # end_ind = [m.end(0) for m in re.finditer(pattern='/', string=self.base_path)][-2]
-                # self.save_path = self.base_path[:end_ind] + outerfold_name + '/' + self.base_path[end_ind:]
-                self.save_path = self.base_path.parent.joinpath(outerfold_name, self.base_path.name)
-            if not self.save_path.exists():
-                self.save_path.mkdir(parents=True, exist_ok=True)
-
-            # get datasets
-            X_test, y_test, sample_ids_test = \
-                self.dataset.X_full[outerfold_info['test']], self.dataset.y_full[outerfold_info['test']], \
-                self.dataset.sample_ids_full[outerfold_info['test']]
-            X_train, y_train, sample_ids_train = \
-                self.dataset.X_full[~np.isin(np.arange(len(self.dataset.X_full)), outerfold_info['test'])], \
-                self.dataset.y_full[~np.isin(np.arange(len(self.dataset.y_full)), outerfold_info['test'])], \
-                self.dataset.sample_ids_full[~np.isin(np.arange(len(self.dataset.sample_ids_full)),
-                                                      outerfold_info['test'])]
-            # create and fit model
-            model: _param_free_base_model.ParamFreeBaseModel = \
-                helper_functions.get_mapping_name_to_class()[self.current_model_name](
-                    task=self.task,
-                )
-            model.save_model(path=self.save_path, filename='unfitted_model')
-            helper_functions.set_all_seeds()
-            start_process_time = time.process_time()
-            start_realclock_time = time.time()
-            y_pred_train = model.fit(X=X_train, y=y_train)
-            process_time_s = time.process_time() - start_process_time
-            real_time_s = time.time() - start_realclock_time
-            self.write_runtime_csv(dict_runtime={
-                'Trial': 'train', 'process_time_s': process_time_s, 'real_time_s': real_time_s,
-                'params': None, 'note': None}
+        model_class = helper_functions.get_mapping_name_to_class()[self.current_model_name]
+        if self.user_input_params["save_final_model"]:
+            # the unfitted model is the same for all outerfolds, so it only needs to be saved once
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            model_class(task=self.task).save_model(path=self.base_path, filename='unfitted_model')
+        # outerfolds are independent of each other and can therefore be fitted in parallel
+        outerfold_results = joblib.Parallel(n_jobs=self.user_input_params["n_jobs"])(
+            joblib.delayed(self.fit_outerfold)(
+                outerfold_name=outerfold_name, outerfold_info=outerfold_info, model_class=model_class
             )
-            if self.user_input_params["save_final_model"]:
-                model.save_model(path=self.save_path, filename='final_retrained_model')
-            y_pred_test = model.predict(X_in=X_test)
-
-            feat_import_df = None
-            if self.current_model_name in ['blup', 'bayesAfromR', 'bayesBfromR', 'bayesCfromR']:
-                feat_import_df = self.get_feature_importance(model=model)
-            # Evaluate and save results
-            eval_scores = \
-                eval_metrics.get_evaluation_report(y_pred=y_pred_test, y_true=y_test, task=self.task, prefix='test_')
-            print('## Results on test set ##')
-            print(eval_scores)
-            final_results = pd.DataFrame(index=range(0, self.dataset.y_full.shape[0]))
-            final_results.at[0:len(sample_ids_train) - 1, 'sample_ids_train'] = sample_ids_train.flatten()
-            final_results.at[0:len(y_pred_train) - 1, 'y_pred_train'] = y_pred_train.flatten()
-            final_results.at[0:len(y_train) - 1, 'y_true_train'] = y_train.flatten()
-            final_results.at[0:len(sample_ids_test) - 1, 'sample_ids_test'] = sample_ids_test.flatten()
-            final_results.at[0:len(y_pred_test) - 1, 'y_pred_test'] = y_pred_test.flatten()
-            final_results.at[0:len(y_test) - 1, 'y_true_test'] = y_test.flatten()
-            for metric, value in eval_scores.items():
-                final_results.at[0, metric] = value
-            final_results.to_csv(self.save_path.joinpath('final_model_test_results.csv'), sep=',', decimal='.',
-                                 float_format='%.10f', index=False)
-
-            runtime_metrics = {
-                'process_time_mean': process_time_s, 'process_time_std': 0,
-                'process_time_max': process_time_s, 'process_time_min': process_time_s,
-                'real_time_mean': real_time_s, 'real_time_std': 0,
-                'real_time_max': real_time_s, 'real_time_min': real_time_s
-            }
+            for outerfold_name, outerfold_info in self.dataset.datasplit_indices.items()
+        )
+        overall_results = {}
+        for outerfold_name, outerfold_result in zip(self.dataset.datasplit_indices.keys(), outerfold_results):
             key = outerfold_name if self.dataset.datasplit == 'nested-cv' else 'Test'
-            overall_results[key] = {'best_params': None, 'eval_metrics': eval_scores,
-                                    'runtime_metrics': runtime_metrics}
-
-            if feat_import_df is not None:
-                feat_import_df.to_csv(self.save_path.joinpath('final_model_feature_importances.csv'), sep=',',
-                                      decimal='.', float_format='%.10f', index=False)
+            overall_results[key] = outerfold_result
         return overall_results
 
-    def write_runtime_csv(self, dict_runtime: dict):
+    def fit_outerfold(self, outerfold_name: str, outerfold_info: dict, model_class: type) -> dict:
+        """
+        Fit and evaluate a parameter-free model for one outerfold and save its results
+
+        :param outerfold_name: name of the outerfold
+        :param outerfold_info: dictionary with outerfold datasplit indices
+        :param model_class: class of the model to fit
+
+        :return: dictionary with results overview of the outerfold
+        """
+        if self.dataset.datasplit == 'nested-cv':
+            # Only print outerfold info for nested-cv as it does not apply for the other splits
+            print("## Starting Fitting for " + outerfold_name + " ##")
+        # local save path as outerfolds might be fitted in parallel, so self is not changed here
+        save_path = self.base_path.parent.joinpath(outerfold_name, self.base_path.name) \
+            if self.dataset.datasplit == 'nested-cv' else self.base_path
+        save_path.mkdir(parents=True, exist_ok=True)
+
+        # get datasets
+        X_full, y_full, sample_ids_full = self.dataset.X_full, self.dataset.y_full, self.dataset.sample_ids_full
+        test_indices = outerfold_info['test']
+        if len(test_indices) > 0 and np.all(np.diff(test_indices) == 1):
+            # contiguous test indices can be sliced, which gives views instead of copies of the data
+            test_indices = slice(test_indices[0], test_indices[-1] + 1)
+        train_mask = np.ones(len(X_full), dtype=bool)
+        train_mask[test_indices] = False
+        X_test, y_test, sample_ids_test = \
+            X_full[test_indices], y_full[test_indices], sample_ids_full[test_indices]
+        X_train, y_train, sample_ids_train = \
+            X_full[train_mask], y_full[train_mask], sample_ids_full[train_mask]
+        # create and fit model
+        model: _param_free_base_model.ParamFreeBaseModel = model_class(task=self.task)
+        helper_functions.set_all_seeds()
+        start_process_time = time.process_time()
+        start_realclock_time = time.time()
+        y_pred_train = model.fit(X=X_train, y=y_train)
+        process_time_s = time.process_time() - start_process_time
+        real_time_s = time.time() - start_realclock_time
+        self.write_runtime_csv(dict_runtime={
+            'Trial': 'train', 'process_time_s': process_time_s, 'real_time_s': real_time_s,
+            'params': None, 'note': None}, save_path=save_path
+        )
+        if self.user_input_params["save_final_model"]:
+            model.save_model(path=save_path, filename='final_retrained_model')
+        y_pred_test = model.predict(X_in=X_test)
+
+        feat_import_df = None
+        if self.current_model_name in ['blup', 'bayesAfromR', 'bayesBfromR', 'bayesCfromR']:
+            feat_import_df = self.get_feature_importance(model=model)
+        # Evaluate and save results
+        eval_scores = \
+            eval_metrics.get_evaluation_report(y_pred=y_pred_test, y_true=y_test, task=self.task, prefix='test_')
+        print('## Results on test set ##')
+        print(eval_scores)
+        # format each column at once and write the table with numpy instead of using pandas' per-cell formatting,
+        # shorter columns are padded with empty cells
+        result_columns = {
+            'sample_ids_train': sample_ids_train.ravel(), 'y_pred_train': y_pred_train.ravel(),
+            'y_true_train': y_train.ravel(), 'sample_ids_test': sample_ids_test.ravel(),
+            'y_pred_test': y_pred_test.ravel(), 'y_true_test': y_test.ravel(),
+            **{metric: np.array([value]) for metric, value in eval_scores.items()}
+        }
+        final_results = np.full((self.dataset.y_full.shape[0], len(result_columns)), '', dtype=object)
+        for col, values in enumerate(result_columns.values()):
+            final_results[:len(values), col] = \
+                values if values.dtype.kind in ('O', 'S', 'U') else np.char.mod('%.10f', values.astype(float))
+        np.savetxt(save_path.joinpath('final_model_test_results.csv'), final_results, fmt='%s',
+                   delimiter=',', header=','.join(result_columns), comments='')
+
+        runtime_metrics = {
+            'process_time_mean': process_time_s, 'process_time_std': 0,
+            'process_time_max': process_time_s, 'process_time_min': process_time_s,
+            'real_time_mean': real_time_s, 'real_time_std': 0,
+            'real_time_max': real_time_s, 'real_time_min': real_time_s
+        }
+        if feat_import_df is not None:
+            feat_import_df.to_csv(save_path.joinpath('final_model_feature_importances.csv'), sep=',',
+                                  decimal='.', float_format='%.10f', index=False)
+        return {'best_params': None, 'eval_metrics': eval_scores, 'runtime_metrics': runtime_metrics}
+
+    def write_runtime_csv(self, dict_runtime: dict, save_path: pathlib.Path):
         """
         Write runtime info to runtime csv file
 
         :param dict_runtime: dictionary with runtime information
+        :param save_path: path of the outerfold where the runtime csv file is stored
         """
-        with open(self.save_path.joinpath(self.current_model_name + '_runtime_overview.csv'), 'a') as runtime_file:
-            headers = ['Trial', 'process_time_s', 'real_time_s', 'params', 'note']
-            writer = csv.DictWriter(f=runtime_file, fieldnames=headers)
-            if runtime_file.tell() == 0:
-                writer.writeheader()
-            writer.writerow(dict_runtime)
+        runtime_csv = helper_functions.RuntimeCsvWriter()
+        runtime_csv.write_row(
+            file_path=save_path.joinpath(self.current_model_name + '_runtime_overview.csv'), row=dict_runtime
+        )
+        runtime_csv.close()
 
     def get_feature_importance(self, model: _param_free_base_model.ParamFreeBaseModel,
                                top_n: int = 1000) -> pd.DataFrame:
@@ -144,7 +144,7 @@ def apply_final_model(results_directory_model: str, old_data_dir: str, new_data_
     final_results.at[0, 'base_model_path'] = results_directory_model
     models_start_time = model_name + '_' + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     final_results.to_csv(save_dir.joinpath(
-        'predict_results_on-' + new_dataset.index_file_name.split('.')[0] + '-' + models_start_time + '.csv'),
+        'predict_results_on-' + pathlib.Path(new_dataset.index_file_name).stem + '-' + models_start_time + '.csv'),
         sep=',', decimal='.', float_format='%.10f', index=False
     )
 
@@ -214,9 +214,10 @@ def retrain_on_new_data(results_directory_model: str, data_dir: str, genotype_ma
         datasplit=datasplit, datasplit_params=datasplit_params
     )
     models_start_time = '+'.join(models) + '_' + datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    base_path = save_dir.joinpath('results', genotype_matrix.split('.')[0], phenotype_matrix.split('.')[0],
-                                  phenotype, datasplit + '_' + datasplit_subpath + '_MAF' + str(maf_percentage) +
-                                  '_' + models_start_time)
+    base_path = save_dir.joinpath(
+        'results', pathlib.Path(genotype_matrix).stem, pathlib.Path(phenotype_matrix).stem, phenotype,
+        f'{datasplit}_{datasplit_subpath}_MAF{maf_percentage}_{models_start_time}'
+    )
     nested_offset = -1 if 'nested' in str(results_directory_model) else 0
     models_old = results_directory_model.parts[-2 + nested_offset].split('_')[3].split('+')
     results_file_path = results_directory_model.parents[0 - nested_offset].joinpath(
@@ -230,16 +231,16 @@ def retrain_on_new_data(results_directory_model: str, data_dir: str, genotype_ma
         print("train on new dataset")
         if 'nested' in datasplit:
             print("outerfold " + str(outerfold_number))
+        # build the save path once per outerfold, it is used for the final model and the results
+        save_path = base_path.joinpath(f'outerfold_{outerfold_number}', model_name) \
+            if 'nested' in datasplit else base_path.joinpath(model_name)
+        save_path.mkdir(parents=True, exist_ok=True)
         model = _model_functions.retrain_model_with_results_file(
             results_file_path=results_file_path, model_name=model_name, datasplit=datasplit,
             outerfold_number=outerfold_number, dataset=new_dataset, saved_outerfold_number=saved_outerfold_number,
             saved_datasplit=results_directory_model.parts[-2 + nested_offset].split('_')[0]
         )
         if save_final_model:
-            save_path = base_path.joinpath('outerfold_' + str(outerfold_number), model_name) \
-                if 'nested' in datasplit else base_path.joinpath(model_name)
-            if not save_path.exists():
-                save_path.mkdir(parents=True)
             model.save_model(path=save_path, filename='final_retrained_model')
         outerfold_info = new_dataset.datasplit_indices['outerfold_' + str(outerfold_number)]
         X_test, y_test, sample_ids_test = \
@@ -266,10 +267,6 @@ def retrain_on_new_data(results_directory_model: str, data_dir: str, genotype_ma
         for metric, value in eval_scores.items():
             final_results.at[0, metric] = value
         final_results.at[0, 'base_model_path'] = results_directory_model
-        save_path = base_path.joinpath('outerfold_' + str(outerfold_number), model_name) \
-            if 'nested' in datasplit else base_path.joinpath(model_name)
-        if not save_path.exists():
-            save_path.mkdir(parents=True)
         final_results.to_csv(save_path.joinpath('final_model_test_results.csv'),
                              sep=',', decimal='.', float_format='%.10f', index=False)
         key = 'outerfold_' + str(outerfold_number) if datasplit == 'nested-cv' else 'Test'
@@ -299,5 +296,5 @@ def retrain_on_new_data(results_directory_model: str, data_dir: str, genotype_ma
     # generate feature importances
     feat_importance.post_generate_feature_importances(
         data_dir=str(data_dir),
-        results_directory_genotype_level=str(save_dir.joinpath('results', genotype_matrix.split('.')[0]))
+        results_directory_genotype_level=str(save_dir.joinpath('results', pathlib.Path(genotype_matrix).stem))
     )
@@ -271,4 +271,5 @@ class Dataset:
 
         :return: name of index file
         """
-        return genotype_matrix_name.split('.')[0] + '-' + phenotype_matrix_name.split('.')[0] + '-' + phenotype + '.h5'
+        return pathlib.Path(genotype_matrix_name).stem + '-' + pathlib.Path(phenotype_matrix_name).stem + '-' \
+            + phenotype + '.h5'
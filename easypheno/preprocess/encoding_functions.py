@@ -1,6 +1,4 @@
 import numpy as np
-import torch
-from torch.nn.functional import one_hot
 
 from ..utils import helper_functions
 
@@ -22,10 +20,9 @@ def get_encoding(models, user_encoding: str) -> list:
         if user_encoding is not None:
             list_of_encodings = [user_encoding]
         else:
-            list_of_encodings = []
-            for model in models:
-                if helper_functions.get_mapping_name_to_class()[model].standard_encoding not in list_of_encodings:
-                    list_of_encodings.append(helper_functions.get_mapping_name_to_class()[model].standard_encoding)
+            mapping_name_to_class = helper_functions.get_mapping_name_to_class()
+            # dict.fromkeys drops duplicates in O(1) per model while keeping the order of first occurrence
+            list_of_encodings = list(dict.fromkeys(mapping_name_to_class[model].standard_encoding for model in models))
     return list_of_encodings
 
 
@@ -67,12 +64,13 @@ def check_encoding_of_genotype(X: np.array) -> str:
     :return: encoding of the genotype matrix
     """
     unique = np.unique(X)
-    if all(z in ['A', 'C', 'G', 'T', 'M', 'R', 'W', 'S', 'Y', 'K'] for z in unique.astype(str)):
+    unique_str = set(unique.astype(str).tolist())
+    if unique_str <= {'A', 'C', 'G', 'T', 'M', 'R', 'W', 'S', 'Y', 'K'}:
         return 'raw'
-    elif all(z in [0, 1, 2] for z in unique):
+    elif set(unique.tolist()) <= {0, 1, 2}:
         return '012'
-    elif all(z in ["AA", "GG", "TT", "CC", "AG", "GA", "CT", "TC", "GC",
-                   "CG", "AT", "TA", "GT", "TG", "AC", "CA"] for z in unique.astype(str)):
+    elif unique_str <= {"AA", "GG", "TT", "CC", "AG", "GA", "CT", "TC", "GC",
+                        "CG", "AT", "TA", "GT", "TG", "AC", "CA"}:
         return 'biallelic'
 
 
@@ -97,6 +95,31 @@ def encode_genotype(X: np.array, required_encoding: str) -> np.array:
         raise Exception('Only able to create additive or onehot encoding.')
 
 
+def get_allele_indices(X: np.array) -> (np.array, np.array):
+    """
+    Get all unique alleles of a genotype matrix and the index of each entry of the matrix within these alleles.
+    Same result as np.unique(X, return_inverse=True), but for single character alleles a lookup table is used
+    instead of sorting the whole matrix.
+
+    :param X: genotype matrix in raw encoding, i.e. containing the alleles
+
+    :return: sorted unique alleles and matrix with the index of each allele (same shape as X)
+    """
+    if X.dtype.kind == 'S' and X.dtype.itemsize == 1:
+        codes = np.ascontiguousarray(X).view(np.uint8)
+    elif X.dtype.kind == 'U' and X.dtype.itemsize == 4:
+        codes = np.ascontiguousarray(X).view(np.uint32)
+    else:
+        codes = None
+    if codes is None or codes.size == 0 or codes.max() > 255:
+        unique, inverse = np.unique(X, return_inverse=True)
+        return unique, inverse.reshape(X.shape)
+    present = np.bincount(codes.ravel(), minlength=256) > 0
+    lookup = np.cumsum(present) - 1
+    unique = np.flatnonzero(present).astype(codes.dtype).view(X.dtype)
+    return unique, lookup[codes]
+
+
 def get_additive_encoding(X: np.array, style: str = '012') -> np.array:
     """
     Generate genotype matrix in additive encoding:
@@ -120,39 +143,32 @@ def get_additive_encoding(X: np.array, style: str = '012') -> np.array:
         shift = 1
     else:
         raise Exception('only allow 012 or 101 as style for additive encoding')
-    alleles = []
-    index_arr = []
     pairs = [['A', 'C'], ['A', 'G'], ['A', 'T'], ['C', 'G'], ['C', 'T'], ['G', 'T']]
     heterozygous_nuc = ['M', 'R', 'W', 'S', 'Y', 'K']
-    for j, col in enumerate(np.transpose(X)):
-        unique, inv, counts = np.unique(col, return_counts=True, return_inverse=True)
-        unique = unique.astype(str)
-        boolean = (unique == 'A') | (unique == 'T') | (unique == 'C') | (unique == 'G')
-        tmp = np.zeros(3) + shift
-        if len(unique) > 3:
-            raise Exception('More than two alleles encountered at snp ' + str(j))
-        elif len(unique) == 3:
-            hetero = unique[~boolean][0]
-            homozygous = unique[boolean]
-            for i, pair in enumerate(pairs):
-                if all(h in pair for h in homozygous) and hetero != heterozygous_nuc[i]:
-                    raise Exception('More than two alleles encountered at snp ' + str(i))
-            tmp[~boolean] = 1.0 - shift
-            tmp[np.argmin(counts[boolean])] = 2.0 - 3*shift
-        elif len(unique) == 2:
-            if list(unique) in pairs:
-                tmp[np.argmin(counts)] = 2.0 - 3*shift
-            else:
-                tmp[(~boolean).nonzero()] = 1.0 - shift
-        else:
-            if unique[0] in heterozygous_nuc:
-                tmp[0] = 1.0 - shift
-        alleles.append(tmp)
-        index_arr.append(inv)
-    alleles = np.transpose(np.array(alleles))
-    ind_arr = np.transpose(np.array(index_arr))
-    cols = np.arange(alleles.shape[1])
-    return alleles[ind_arr, cols]
+    n_snps = X.shape[1]
+    cols = np.arange(n_snps)
+    # map all alleles to integer codes once and count the occurrences of each code per SNP
+    unique, inv = get_allele_indices(X)
+    unique = unique.astype(str)
+    counts = np.bincount((inv * n_snps + cols).ravel(), minlength=len(unique) * n_snps).reshape(len(unique), n_snps)
+    present = counts > 0
+    homozygous = np.isin(unique, ['A', 'C', 'G', 'T'])
+    n_alleles = present.sum(axis=0)
+    n_homozygous = present[homozygous].sum(axis=0)
+    # three alleles are only valid for two homozygous alleles and the matching heterozygous one
+    valid_three_alleles = np.zeros(n_snps, dtype=bool)
+    for pair, hetero in zip(pairs, heterozygous_nuc):
+        if all(nuc in unique for nuc in pair + [hetero]):
+            valid_three_alleles |= np.all(present[np.isin(unique, pair + [hetero])], axis=0)
+    invalid = (n_alleles > 3) | ((n_alleles == 3) & ~valid_three_alleles)
+    if np.any(invalid):
+        raise Exception('More than two alleles encountered at snp ' + str(np.argmax(invalid)))
+    alleles = np.tile(np.where(homozygous, 0.0 + shift, 1.0 - shift)[:, np.newaxis], (1, n_snps))
+    # homozygous minor allele is the less frequent one in case two homozygous alleles are present
+    two_homozygous = n_homozygous == 2
+    minor = np.argmin(np.where(present & homozygous[:, np.newaxis], counts, np.iinfo(counts.dtype).max), axis=0)
+    alleles[minor[two_homozygous], cols[two_homozygous]] = 2.0 - 3*shift
+    return alleles[inv, cols]
 
 
 def get_onehot_encoding(X: np.array) -> np.array:
@@ -182,7 +198,7 @@ def get_onehot_encoding(X: np.array) -> np.array:
 
     :return: genotype matrix in onehot encoding (X_onehot)
     """
-    unique, inverse = np.unique(X, return_inverse=True)
-    inverse = inverse.reshape(X.shape)
-    X_onehot = one_hot(torch.from_numpy(inverse)).numpy()
+    unique, inverse = get_allele_indices(X)
+    # store as uint8 as an int64 per onehot entry is not needed and multiplies the memory consumption
+    X_onehot = np.eye(len(unique), dtype=np.uint8)[inverse]
     return X_onehot
@@ -43,7 +43,7 @@ def prepare_data_files(data_dir: pathlib.Path, genotype_matrix_name: str, phenot
             (genotype_matrix_name.split('.')[-1] != 'h5'):
         print("Found same file name with ending .h5")
         print("Assuming that the raw file was already prepared using our pipepline. Will continue with the .h5 file.")
-        genotype_matrix_name = genotype_matrix_name.split('.')[0] + '.h5'
+        genotype_matrix_name = pathlib.Path(genotype_matrix_name).stem + '.h5'
     suffix = genotype_matrix_name.split('.')[-1]
     if suffix in ('h5', 'hdf5', 'h5py'):
         # Genotype matrix has standard file format -> check information in the file
@@ -53,8 +53,8 @@ def prepare_data_files(data_dir: pathlib.Path, genotype_matrix_name: str, phenot
         # Check / create index files
         if check_index_file(data_dir=data_dir, genotype_matrix_name=genotype_matrix_name,
                             phenotype_matrix_name=phenotype_matrix_name, phenotype=phenotype):
-            print('Index file ' + genotype_matrix_name.split('.')[0] + '-'
-                    + phenotype_matrix_name.split('.')[0] + '-' + phenotype + '.h5' + ' already exists.'
+            print('Index file ' + pathlib.Path(genotype_matrix_name).stem + '-'
+                    + pathlib.Path(phenotype_matrix_name).stem + '-' + phenotype + '.h5' + ' already exists.'
                     ' Will append required filters and data splits now.')
             append_index_file(data_dir=data_dir, genotype_matrix_name=genotype_matrix_name,
                               phenotype_matrix_name=phenotype_matrix_name, phenotype=phenotype,
@@ -64,7 +64,8 @@ def prepare_data_files(data_dir: pathlib.Path, genotype_matrix_name: str, phenot
                               val_set_size_percentage=val_set_size_percentage)
             print('Done checking data files. All required datasets are available.')
         else:
-            print('Index file ' + genotype_matrix_name.split('.')[0] + '-' + phenotype_matrix_name.split('.')[0]
+            print('Index file ' + pathlib.Path(genotype_matrix_name).stem + '-'
+                  + pathlib.Path(phenotype_matrix_name).stem
                   + '-' + phenotype + '.h5' + ' does not fulfill requirements. '
                                               'Will load genotype and phenotype matrix and create new index file.')
             save_all_data_files(data_dir=data_dir, genotype_matrix_name=genotype_matrix_name,
@@ -125,7 +126,8 @@ def check_index_file(data_dir: pathlib.Path, genotype_matrix_name: str, phenotyp
 
     :return: bool reflecting check result
     """
-    index_file = data_dir.joinpath(genotype_matrix_name.split('.')[0] + '-' + phenotype_matrix_name.split('.')[0] \
+    index_file = data_dir.joinpath(pathlib.Path(genotype_matrix_name).stem + '-'
+                                   + pathlib.Path(phenotype_matrix_name).stem \
                  + '-' + phenotype + '.h5')
     if index_file.is_file():
         matched_datasets = ['y', 'matched_sample_ids', 'X_index', 'y_index', 'non_informative_filter', 'ma_frequency']
@@ -426,17 +428,20 @@ def check_and_load_phenotype_matrix(data_dir: pathlib.Path, phenotype_matrix_nam
     phenotype_file = data_dir.joinpath(phenotype_matrix_name)
     suffix = phenotype_file.suffix
     if suffix == ".csv":
-        y = pd.read_csv(phenotype_file)
+        sep = ","
     elif suffix in (".pheno", ".txt"):
-        y = pd.read_csv(phenotype_file, sep=" ")
+        sep = " "
     else:
         raise Exception('Only accept .csv, .pheno, .txt phenotype files. See documentation for help')
-    y = y.sort_values(y.columns[0]).groupby(y.columns[0]).mean()
-    if phenotype not in y.columns:
+    # read the header first to only parse the sample ids and the specified phenotype
+    columns = pd.read_csv(phenotype_file, sep=sep, nrows=0, engine='c').columns
+    # the first column contains the sample ids, so it can not be the phenotype
+    if phenotype not in columns[1:]:
         raise Exception('Phenotype ' + phenotype + ' is not in phenotype file ' + phenotype_matrix_name +
                         ' See documentation for help')
-    else:
-        y = y[[phenotype]].dropna()
+    y = pd.read_csv(phenotype_file, sep=sep, usecols=[columns[0], phenotype], engine='c')
+    y = y.sort_values(columns[0]).groupby(columns[0]).mean()
+    y = y[[phenotype]].dropna()
     return y
 
 
@@ -492,8 +497,8 @@ def append_index_file(data_dir: pathlib.Path, genotype_matrix_name: str, phenoty
     :param test_set_size_percentage: size of the test set relevant for cv-test and train-val-test
     :param val_set_size_percentage: size of the validation set relevant for train-val-test
     """
-    with h5py.File(data_dir.joinpath(genotype_matrix_name.split('.')[0] + '-'
-                   + phenotype_matrix_name.split('.')[0] + '-' + phenotype + '.h5'), 'a') as f:
+    with h5py.File(data_dir.joinpath(pathlib.Path(genotype_matrix_name).stem + '-'
+                   + pathlib.Path(phenotype_matrix_name).stem + '-' + phenotype + '.h5'), 'a') as f:
         # check if group 'maf_filter' is available and if user input maf is available, if not: create group/dataset
         if 'maf_filter' not in f:
             maf = f.create_group('maf_filter')
@@ -670,8 +675,8 @@ def create_index_file(data_dir: pathlib.Path, genotype_matrix_name: str, phenoty
                                            user_val_set_size_percentage=val_set_size_percentage,
                                            datasplit='train-val-test', param_to_check=param_tvt)
 
-    with h5py.File(data_dir.joinpath(genotype_matrix_name.split('.')[0] + '-'
-                   + phenotype_matrix_name.split('.')[0] + '-' + phenotype + '.h5'), 'w') as f:
+    with h5py.File(data_dir.joinpath(pathlib.Path(genotype_matrix_name).stem + '-'
+                   + pathlib.Path(phenotype_matrix_name).stem + '-' + phenotype + '.h5'), 'w') as f:
         # all data needed to redo matching of X and y and to create new mafs and new data splits
         data = f.create_group('matched_data')
         data.create_dataset('y', data=y, chunks=True, compression="gzip")
@@ -748,8 +753,12 @@ def get_minor_allele_freq(X: np.array) -> np.array:
     if encoding == '012':
         return (np.sum(X, 0)) / (2 * X.shape[0])
     else:
-        freq = []
-        for i, col in enumerate(np.transpose(X)):
+        pairs = [['A', 'C'], ['A', 'G'], ['A', 'T'], ['C', 'G'], ['C', 'T'], ['G', 'T']]
+        heterozygous_nuc = ['M', 'R', 'W', 'S', 'Y', 'K']
+        # fill a preallocated array instead of appending to a list and converting it afterwards
+        freq = np.empty(X.shape[1])
+        for i in range(X.shape[1]):
+            col = X[:, i]
             unique, counts = np.unique(col, return_counts=True)
             if len(unique) > 3:
                 raise Exception('More than two alleles encountered at SNP ', i)
@@ -758,15 +767,13 @@ def get_minor_allele_freq(X: np.array) -> np.array:
                             unique.astype(str) == 'G')
                 homozygous = unique[boolean]
                 hetero = unique[~boolean][0]
-                pairs = [['A', 'C'], ['A', 'G'], ['A', 'T'], ['C', 'G'], ['C', 'T'], ['G', 'T']]
-                heterozygous_nuc = ['M', 'R', 'W', 'S', 'Y', 'K']
                 for j, pair in enumerate(pairs):
                     if all(h in pair for h in homozygous) and hetero != heterozygous_nuc[j]:
                         raise Exception('More than two alleles encountered at SNP ' + str(i))
-                freq.append((np.min(counts[boolean]) + 0.5 * counts[~boolean][0]) / len(col))
+                freq[i] = (np.min(counts[boolean]) + 0.5 * counts[~boolean][0]) / len(col)
             else:
-                freq.append(np.min(counts) / len(col))
-        return np.array(freq)
+                freq[i] = np.min(counts) / len(col)
+        return freq
 
 
 def create_maf_filter(maf: int, freq: np.array) -> np.array:
@@ -81,6 +81,9 @@ if __name__ == '__main__':
     parser.add_argument("-ofn", "--outerfold_number_to_run", type=int, default=None,
                         help="Use this parameter in case you only want to run the optimization for one outer fold, "
                              "counting starts at 0")
+    parser.add_argument("-nj", "--n_jobs", type=int, default=1,
+                        help="Only relevant for parameter-free models: number of outerfolds to fit in parallel, "
+                             "-1 uses all CPUs")
 
     args = vars(parser.parse_args())
     phenotypes = args["phenotype"]
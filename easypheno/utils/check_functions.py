@@ -1,91 +1,217 @@
+import os
+import csv
+import asyncio
+import functools
 import pathlib
-import pandas as pd
 import numpy as np
 
 from . import helper_functions
 from ..model import _param_free_base_model, _torch_model, _tensorflow_model
 
 
+# argument name, description for error message, lower and upper bound of the valid values
+_VALUE_RANGES = (
+    ('maf_percentage', 'maf value of', 0, 20),
+    ('test_set_size_percentage', 'test set size in percentage', 5, 30),
+    ('val_set_size_percentage', 'validation set size in percentage', 5, 30),
+    ('n_outerfolds', 'number of outerfolds', 3, 10),
+    ('n_innerfolds', 'number of innerfolds/folds', 3, 10)
+)
+_VALID_DATASPLITS = frozenset({'nested-cv', 'cv-test', 'train-val-test'})
+_VALID_ENCODINGS = frozenset({'raw', '012', 'onehot'})
+_CHECKED_ARGUMENT_NAMES = (
+    'save_dir', 'data_dir', 'genotype_matrix', 'phenotype_matrix', 'phenotype', 'models', 'encoding', 'datasplit',
+    'maf_percentage', 'test_set_size_percentage', 'val_set_size_percentage', 'n_outerfolds', 'n_innerfolds',
+    'n_trials', 'batch_size', 'n_epochs', 'n_jobs'
+)
+# arguments that already passed all checks, see _get_validation_key
+_validated_arguments = set()
+# phenotype file path mapped to its modification time and column names, see _get_phenotype_columns
+_phenotype_columns_cache = {}
+
+
 def check_all_specified_arguments(arguments: dict):
     """
-    Check all specified arguments for plausibility
+    Check all specified arguments for plausibility. All invalid arguments are collected and reported at once.
 
     :param arguments: all arguments provided by the user
     """
-    # Check existence of save_dir
-    if not arguments["save_dir"].exists():
-        raise Exception("Specified save_dir " + str(arguments["save_dir"]) + " does not exist. Please double-check.")
-    # Check existence of genotype and phenotype file
-    if not arguments["data_dir"].joinpath(arguments["genotype_matrix"]).is_file():
-        raise Exception('Specified genotype file ' + arguments["genotype_matrix"] + ' does not exist in '
-                        + str(arguments["data_dir"]) + '. Please check spelling.')
-    phenotype_file = arguments["data_dir"].joinpath(arguments["phenotype_matrix"])
-    if not phenotype_file.is_file():
-        raise Exception('Specified phenotype file ' + arguments["phenotype_matrix"] + ' does not exist in '
-                        + str(arguments["data_dir"]) + '. Please check spelling.')
-    # Check existence of specified phenotype in phenotype file
-    phenotype = pd.read_csv(phenotype_file)
-    if arguments["phenotype"] not in phenotype.columns:
-        raise Exception('Specified phenotype ' + arguments["phenotype"] + ' does not exist in phenotype file '
-                        + str(phenotype_file) + '. Check spelling.')
+    is_valid, errors = try_check_all_specified_arguments(arguments=arguments)
+    if not is_valid:
+        raise Exception('\n'.join(errors))
+
+
+def try_check_all_specified_arguments(arguments: dict) -> (bool, list):
+    """
+    Check all specified arguments for plausibility without raising an exception for invalid arguments
+
+    :param arguments: all arguments provided by the user
+
+    :return: True if all arguments are valid, False otherwise, and list with an error message for each invalid argument
+    """
+    validation_key = _get_validation_key(arguments=arguments)
+    if validation_key in _validated_arguments:
+        return True, []
+    errors = _get_argument_value_errors(arguments=arguments)
+    # checks accessing the file system come last, so invalid argument values are reported without any file access
+    errors.extend(_get_file_errors(arguments=arguments))
+    if not errors:
+        _validated_arguments.add(validation_key)
+    return not errors, errors
+
+
+async def check_all_specified_arguments_async(arguments: dict):
+    """
+    Check all specified arguments for plausibility.
+    Same checks as check_all_specified_arguments, but the checks accessing the file system run in a thread
+    while the argument values are checked.
+
+    :param arguments: all arguments provided by the user
+    """
+    validation_key = _get_validation_key(arguments=arguments)
+    if validation_key in _validated_arguments:
+        return
+    file_check = asyncio.get_running_loop().run_in_executor(None, functools.partial(_get_file_errors, arguments))
+    errors = _get_argument_value_errors(arguments=arguments)
+    errors.extend(await file_check)
+    if errors:
+        raise Exception('\n'.join(errors))
+    _validated_arguments.add(validation_key)
+
+
+def _get_validation_key(arguments: dict) -> tuple:
+    """
+    Get a hashable key of all checked arguments to skip repeated checks of the same arguments
+
+    :param arguments: all arguments provided by the user
+
+    :return: tuple with the values of all checked arguments
+    """
+    return tuple(
+        tuple(arguments[name]) if isinstance(arguments.get(name), list) else arguments.get(name)
+        for name in _CHECKED_ARGUMENT_NAMES
+    )
+
+
+def _get_argument_value_errors(arguments: dict) -> list:
+    """
+    Check the values of all specified arguments that can be checked without accessing the file system
+
+    :param arguments: all arguments provided by the user
+
+    :return: list with an error message for each invalid argument
+    """
+    errors = []
+    models, encoding = arguments["models"], arguments["encoding"]
+    mapping_name_to_class = helper_functions.get_mapping_name_to_class()
 
     # Check meaningfulness of specified values
-    if not (0 <= arguments["maf_percentage"] <= 20):
-        raise Exception('Specified maf value of ' + str(arguments["maf_percentage"]) 
-                        + ' is invalid, has to be between 0 and 20.')
-    if not (5 <= arguments["test_set_size_percentage"] <= 30):
-        raise Exception('Specified test set size in percentage ' + str(arguments["test_set_size_percentage"]) +
-                        ' is invalid, has to be between 5 and 30.')
-    if not (5 <= arguments["val_set_size_percentage"] <= 30):
-        raise Exception('Specified validation set size in percentage ' 
-                        + str(arguments["val_set_size_percentage"]) + ' is invalid, has to be between 5 and 30.')
-    if not (3 <= arguments["n_outerfolds"] <= 10):
-        raise Exception('Specified number of outerfolds ' + str(arguments["n_outerfolds"]) +
-                        ' is invalid, has to be between 3 and 10.')
-    if not (3 <= arguments["n_innerfolds"] <= 10):
-        raise Exception('Specified number of innerfolds/folds ' + str(arguments["n_innerfolds"]) +
-                        ' is invalid, has to be between 3 and 10.')
-    if "n_trials" in arguments and any([not issubclass(helper_functions.get_mapping_name_to_class()[model],
-                                                       _param_free_base_model.ParamFreeBaseModel)
-                                        for model in arguments["models"]]) and arguments["n_trials"] < 10:
-        raise Exception('Specified number of trials with ' + str(arguments["n_trials"]) + ' is invalid, at least 10.')
+    for argument_name, description, lower_bound, upper_bound in _VALUE_RANGES:
+        if not (lower_bound <= arguments[argument_name] <= upper_bound):
+            errors.append('Specified ' + description + ' ' + str(arguments[argument_name]) + ' is invalid, has to be '
+                          'between ' + str(lower_bound) + ' and ' + str(upper_bound) + '.')
 
     # Check spelling of datasplit and model
-    if arguments["datasplit"] not in ['nested-cv', 'cv-test', 'train-val-test']:
-        raise Exception('Specified datasplit ' + arguments["datasplit"] + ' is invalid, '
-                        'has to be: nested-cv | cv-test | train-val-test')
-    if (arguments["models"] != 'all') and \
-            (any(model not in helper_functions.get_list_of_implemented_models() for model in arguments["models"])):
-        raise Exception('At least one specified model in "' + str(arguments["models"]) +
-                        '" not found in implemented models nor "all" specified.' +
-                        ' Check spelling or if implementation exists. Implemented models: ' +
-                        str(helper_functions.get_list_of_implemented_models()))
+    if arguments["datasplit"] not in _VALID_DATASPLITS:
+        errors.append('Specified datasplit ' + arguments["datasplit"] + ' is invalid, '
+                      'has to be: nested-cv | cv-test | train-val-test')
+    implemented_models = helper_functions.get_list_of_implemented_models()
+    if models == 'all':
+        known_models = implemented_models
+    else:
+        implemented_models_set = frozenset(implemented_models)
+        unknown_models = [model for model in models if model not in implemented_models_set]
+        if unknown_models:
+            errors.append('Specified models ' + str(unknown_models) + ' in "' + str(models) +
+                          '" not found in implemented models nor "all" specified.' +
+                          ' Check spelling or if implementation exists. Implemented models: ' +
+                          str(implemented_models))
+        known_models = [model for model in models if model in implemented_models_set]
+    # the following checks depend on the model classes, so only the known models can be considered
+    model_classes = [mapping_name_to_class[model] for model in known_models if model in mapping_name_to_class]
+    if "n_trials" in arguments and arguments["n_trials"] < 10 and \
+            any([not issubclass(model_class, _param_free_base_model.ParamFreeBaseModel)
+                 for model_class in model_classes]):
+        errors.append('Specified number of trials with ' + str(arguments["n_trials"]) + ' is invalid, at least 10.')
+    if "n_jobs" in arguments and not (arguments["n_jobs"] == -1 or arguments["n_jobs"] >= 1):
+        errors.append('Specified number of jobs ' + str(arguments["n_jobs"]) +
+                      ' is invalid, has to be -1 (all CPUs) or at least 1.')
 
     # Check encoding
-    if arguments["encoding"] is not None:
-        if arguments["encoding"] not in ['raw', '012', 'onehot']:
-            raise Exception('Specified encoding ' + arguments["encoding"] + ' is not valid. See help.')
-        else:
-            if arguments["models"] == 'all' or len(arguments["models"]) > 1:
-                raise Exception('If "all" models are specified, standard encodings are used. Do not specify encoding')
-            else:
-                if arguments["encoding"] not in \
-                        helper_functions.get_mapping_name_to_class()[arguments["models"][0]].possible_encodings:
-                    raise Exception(arguments["encoding"] + ' is not valid for ' + arguments["models"][0] +
-                                    '. Check possible_encodings in model file.')
+    if encoding is not None:
+        if encoding not in _VALID_ENCODINGS:
+            errors.append('Specified encoding ' + encoding + ' is not valid. See help.')
+        elif models == 'all' or len(models) > 1:
+            errors.append('If "all" models are specified, standard encodings are used. Do not specify encoding')
+        elif model_classes and encoding not in model_classes[0].possible_encodings:
+            errors.append(encoding + ' is not valid for ' + models[0] + '. Check possible_encodings in model file.')
 
     # Only relevant for neural networks
-    if any([issubclass(helper_functions.get_mapping_name_to_class()[model], _torch_model.TorchModel) or \
-            issubclass(helper_functions.get_mapping_name_to_class()[model] ,  _tensorflow_model.TensorflowModel)
-            for model in arguments["models"]]):
-        if arguments["batch_size"] is not None:
-            if not (2**3 <= arguments["batch_size"] <= 2**8):
-                raise Exception('Specified batch size ' + str(arguments["batch_size"]) +
-                                ' is invalid, has to be between 8 and 256.')
-        if arguments["n_epochs"] is not None:
-            if not (50 <= arguments["n_epochs"] <= 1000000):
-                raise Exception('Specified number of epochs ' + str(arguments["n_epochs"]) +
-                                ' is invalid, has to be between 50 and 1.000.000.')
+    if any([issubclass(model_class, (_torch_model.TorchModel, _tensorflow_model.TensorflowModel))
+            for model_class in model_classes]):
+        batch_size, n_epochs = arguments["batch_size"], arguments["n_epochs"]
+        if batch_size is not None:
+            if not (2**3 <= batch_size <= 2**8):
+                errors.append('Specified batch size ' + str(batch_size) +
+                              ' is invalid, has to be between 8 and 256.')
+        if n_epochs is not None:
+            if not (50 <= n_epochs <= 1000000):
+                errors.append('Specified number of epochs ' + str(n_epochs) +
+                              ' is invalid, has to be between 50 and 1.000.000.')
+    return errors
+
+
+def _get_file_errors(arguments: dict) -> list:
+    """
+    Check the existence of the specified directories and files as well as of the phenotype in the phenotype file
+
+    :param arguments: all arguments provided by the user
+
+    :return: list with an error message for each missing directory, file or phenotype
+    """
+    errors = []
+    save_dir, data_dir = arguments["save_dir"], arguments["data_dir"]
+    genotype_matrix, phenotype_matrix = arguments["genotype_matrix"], arguments["phenotype_matrix"]
+    phenotype = arguments["phenotype"]
+    # Check existence of save_dir
+    if not save_dir.exists():
+        errors.append("Specified save_dir " + str(save_dir) + " does not exist. Please double-check.")
+    # Check existence of genotype and phenotype file
+    if not data_dir.joinpath(genotype_matrix).is_file():
+        errors.append('Specified genotype file ' + genotype_matrix + ' does not exist in '
+                      + str(data_dir) + '. Please check spelling.')
+    phenotype_file = data_dir.joinpath(phenotype_matrix)
+    if not phenotype_file.is_file():
+        errors.append('Specified phenotype file ' + phenotype_matrix + ' does not exist in '
+                      + str(data_dir) + '. Please check spelling.')
+        return errors
+    # Check existence of specified phenotype in phenotype file
+    if phenotype not in _get_phenotype_columns(phenotype_file=phenotype_file):
+        errors.append('Specified phenotype ' + phenotype + ' does not exist in phenotype file '
+                      + str(phenotype_file) + '. Check spelling.')
+    return errors
+
+
+def _get_phenotype_columns(phenotype_file: pathlib.Path) -> frozenset:
+    """
+    Get the column names of a phenotype file. The columns are cached together with the modification time of the file,
+    so the file is only read again if it was changed.
+
+    :param phenotype_file: path of the phenotype file
+
+    :return: set with all column names
+    """
+    modification_time = os.stat(phenotype_file).st_mtime_ns
+    cached = _phenotype_columns_cache.get(phenotype_file)
+    if cached is not None and cached[0] == modification_time:
+        return cached[1]
+    # only the header line is needed to check the columns, so read it with the csv module instead of pandas
+    # (same separators as used in raw_data_functions.load_phenotype)
+    with open(phenotype_file, newline='', encoding='utf-8-sig') as file:
+        separator = ' ' if phenotype_file.suffix in ('.pheno', '.txt') else ','
+        phenotype_columns = frozenset(next(csv.reader(file, delimiter=separator), []))
+    _phenotype_columns_cache[phenotype_file] = (modification_time, phenotype_columns)
+    return phenotype_columns
 
 
 def check_exist_directories(list_of_dirs: list, create_if_not_exist: bool = False) -> bool:
@@ -103,7 +229,7 @@ def check_exist_directories(list_of_dirs: list, create_if_not_exist: bool = Fals
             print("Directory " + str(dir_to_check) + " not existing.")
             if create_if_not_exist:
                 print("Will create it.")
-                dir_to_check.mkdir(parents=True)
+                dir_to_check.mkdir(parents=True, exist_ok=True)
             else:
                 print("Please correct it.")
                 check = False
@@ -1,5 +1,7 @@
 import os
+import csv
 import inspect
+import functools
 import importlib
 import torch
 import random
@@ -56,6 +58,20 @@ def get_mapping_name_to_class() -> dict:
         files = os.listdir('easypheno/model')
     else:
         files = [model_file + '.py' for model_file in easypheno.model.__all__]
+    # copy as the cached mapping must not be altered by the caller
+    return dict(_get_mapping_for_model_files(files=tuple(sorted(files))))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_mapping_for_model_files(files: tuple) -> dict:
+    """
+    Import the model modules and map their names to the classes defined in them.
+    Cached as the import and inspection of all modules is repeated for every model otherwise.
+
+    :param files: file names in package model
+
+    :return: dictionary with mapping model name to class name
+    """
     modules_mapped = {}
     for file in files:
         if file not in ['__init__.py', '__pycache__']:
@@ -70,6 +86,50 @@ def get_mapping_name_to_class() -> dict:
     return modules_mapped
 
 
+class RuntimeCsvWriter:
+    """
+    Writer for the runtime overview csv files. The file is kept open while writing to the same file
+    instead of reopening it for every row.
+
+    **Attributes**
+
+        - file (*TextIO*): opened runtime csv file, None if no file is opened
+        - writer (*csv.DictWriter*): writer for the opened runtime csv file
+    """
+
+    headers = ['Trial', 'process_time_s', 'real_time_s', 'params', 'note']
+
+    def __init__(self):
+        self.file = None
+        self.writer = None
+
+    def write_row(self, file_path: pathlib.Path, row: dict):
+        """
+        Write runtime info to a runtime csv file, the file is (re)opened if it differs from the opened one
+
+        :param file_path: path of the runtime csv file
+        :param row: dictionary with runtime information
+        """
+        if self.file is None or self.file.name != str(file_path):
+            self.close()
+            self.file = open(file_path, 'a')
+            self.writer = csv.DictWriter(f=self.file, fieldnames=self.headers)
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+        self.writer.writerow(row)
+        # flush as the file is read or copied during the run
+        self.file.flush()
+
+    def close(self):
+        """
+        Close the runtime csv file in case it is opened
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+
 def set_all_seeds(seed: int = 42):
     """
     Set all seeds of libs with a specific function for reproducibility of results